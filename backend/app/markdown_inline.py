@@ -0,0 +1,48 @@
+"""
+Inline Markdown -> ReportLab Paragraph markup. Kept free of ReportLab imports so the
+conversion can be exercised on its own.
+"""
+import re
+
+__all__ = ["md_inline_to_rl"]
+
+_MD_CODE_RE = re.compile(r"`([^`]+)`")
+_MD_BOLD_RE = re.compile(r"\*\*([^*]+)\*\*")
+_MD_ITALIC_RE = re.compile(r"(?<!\*)\*([^*]+)\*(?!\*)")
+_CODE_SLOT_RE = re.compile("\x00(\\d+)\x00")
+
+# NUL is dropped (ReportLab cannot render it) so it is free to mark code-span slots.
+_XML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\x00": None})
+
+
+def md_inline_to_rl(text: str) -> str:
+    """
+    Convert a small, safe subset of Markdown inline formatting to ReportLab's
+    Paragraph markup (HTML-ish): **bold**, *italic*, `code`.
+    """
+    if not text:
+        return ""
+
+    # Escape basic XML chars first
+    text = text.translate(_XML_ESCAPE)
+
+    # Inline code: park each span in a slot so emphasis markers inside it stay
+    # literal, while bold/italic around it still apply.
+    code_spans: list[str] = []
+    if "`" in text:
+        def park(m: re.Match[str]) -> str:
+            code_spans.append(m.group(1))
+            return f"\x00{len(code_spans) - 1}\x00"
+
+        text = _MD_CODE_RE.sub(park, text)
+
+    if "*" in text:
+        # Bold **...** before italic, so ***x*** nests as <i><b>x</b></i>
+        text = _MD_BOLD_RE.sub(r"<b>\1</b>", text)
+        # Italic *...* (avoid clobbering bullet markers and already-converted tags)
+        text = _MD_ITALIC_RE.sub(r"<i>\1</i>", text)
+
+    if code_spans:
+        text = _CODE_SLOT_RE.sub(lambda m: f'<font face="Courier">{code_spans[int(m.group(1))]}</font>', text)
+
+    return text
@@ -0,0 +1,68 @@
+"""
+PDF text extraction. Kept free of app imports so spawned extraction workers only
+load the PDF libraries, not FastAPI, ReportLab or the route table.
+"""
+import io
+import threading
+
+import pypdfium2 as pdfium
+from pypdf import PdfReader
+
+__all__ = ["count_pdf_pages", "extract_pdf_pages", "extract_pdf_text"]
+
+# PDFium is not thread-safe, even across separate documents, and pypdfium2 does no
+# locking of its own. Every in-process PDFium call goes through this lock; pool
+# workers are single-threaded, so it is uncontended there.
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _pdfium_pages_text(file_bytes: bytes, start: int, stop: int | None) -> str:
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(file_bytes)
+        try:
+            parts: list[str] = []
+            for i in range(start, len(pdf) if stop is None else stop):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                parts.append(textpage.get_text_bounded())
+                textpage.close()
+                page.close()
+            return "\n".join(parts)
+        finally:
+            pdf.close()
+
+
+def _pdfium_page_count(file_bytes: bytes) -> int:
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(file_bytes)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+def _pypdf_pages_text(file_bytes: bytes, start: int, stop: int | None) -> str:
+    reader = PdfReader(io.BytesIO(file_bytes))
+    pages = reader.pages
+    return "\n".join(pages[i].extract_text() or "" for i in range(start, len(pages) if stop is None else stop))
+
+
+def count_pdf_pages(file_bytes: bytes) -> int:
+    try:
+        return _pdfium_page_count(file_bytes)
+    except pdfium.PdfiumError:
+        return len(PdfReader(io.BytesIO(file_bytes)).pages)
+
+
+def extract_pdf_pages(file_bytes: bytes, start: int = 0, stop: int | None = None) -> str:
+    # Module-level so it can run in the process pool; parses the PDF once per range.
+    # PDFium (native) is much faster than pypdf; pypdf stays as the fallback for
+    # documents PDFium cannot open or read.
+    try:
+        return _pdfium_pages_text(file_bytes, start, stop)
+    except pdfium.PdfiumError:
+        return _pypdf_pages_text(file_bytes, start, stop)
+
+
+def extract_pdf_text(file_bytes: bytes) -> str:
+    return extract_pdf_pages(file_bytes).strip()
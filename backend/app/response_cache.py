@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+__all__ = ["ResponseCache", "SingleFlight", "input_digest"]
+
+_T = TypeVar("_T")
+
+
+def input_digest(text: str) -> str:
+    """
+    Digest of the analysed text with whitespace collapsed, so copies that differ
+    only in spacing or line breaks share cache entries.
+    """
+    # str.split() uses the same whitespace set as the regex \s, without a regex pass.
+    normalized = " ".join(text.split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """Small in-process LRU for hat responses. A maxsize of 0 disables caching."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, str] = OrderedDict()
+
+    def get(self, key: Hashable) -> str | None:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: str) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+@dataclass(slots=True)
+class _Call:
+    task: "asyncio.Future[Any]"
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key onto one underlying task. The task is
+    cancelled only once every caller waiting on it has gone away.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call] = {}
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[_T]]) -> tuple[_T, bool]:
+        """Return (result, joined), where joined is True if another caller started the work."""
+        call = self._calls.get(key)
+        joined = call is not None
+        if call is None:
+            call = _Call(asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task, c=call: self._forget(key, c))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), joined
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Drop the entry now rather than from the done-callback: the task may take
+                # several loop iterations to unwind, and a new caller must not join it.
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
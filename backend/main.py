@@ -1,8 +1,12 @@
 import asyncio
 import io
+import multiprocessing
 import os
-from datetime import datetime
-from typing import Any
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, AsyncIterator, Sequence
 from pathlib import Path
 
 import re
@@ -16,20 +20,23 @@ from reportlab.platypus import (
 )
 
 import httpx
+import orjson
 from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse, FileResponse, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pypdf import PdfReader
 from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.platypus import ListFlowable, ListItem, Paragraph, SimpleDocTemplate, Spacer
 
 # FIX 1: import prompts from the same directory (matches uploaded prompts.py)
-from backend.app.prompts import AGENT_CONFIGS
-from backend.app.prompts_short import AGENT_CONFIGS_SHORT
+from backend.app.markdown_inline import md_inline_to_rl
+from backend.app.pdf_text import count_pdf_pages, extract_pdf_pages, extract_pdf_text
+from backend.app.prompts import HatConfig, get_agent_configs
+from backend.app.response_cache import ResponseCache, SingleFlight, input_digest
 
 MAX_TEXT_CHARS = 200_000
 MAX_PDF_BYTES = 10 * 1024 * 1024
@@ -37,21 +44,65 @@ MAX_PDF_BYTES = 10 * 1024 * 1024
 DEFAULT_MODEL = os.getenv("GEMMA_MODEL", "aisingapore/Gemma-SEA-LION-v4-27B-IT")
 GEMMA_API_URL = os.getenv("GEMMA_API_URL", "").strip()
 GEMMA_API_KEY = os.getenv("GEMMA_API_KEY", "").strip()
+# Opt-in "cache_prompt" hint for servers that reuse the KV cache of a shared prompt
+# prefix (e.g. llama.cpp). Off by default: strict OpenAI-style APIs reject unknown fields.
+GEMMA_CACHE_PROMPT = os.getenv("GEMMA_CACHE_PROMPT", "").strip().lower() in {"1", "true", "yes"}
 
-app = FastAPI(title="Six Thinking Hats Analysis API")
+app = FastAPI(title="Six Thinking Hats Analysis API", default_response_class=ORJSONResponse)
 
 MAX_CONCURRENT_MODEL_CALLS = int(os.getenv("MAX_CONCURRENT_MODEL_CALLS", "12"))
 HTTPX_MAX_CONNECTIONS = int(os.getenv("HTTPX_MAX_CONNECTIONS", "20"))
-HTTPX_MAX_KEEPALIVE = int(os.getenv("HTTPX_MAX_KEEPALIVE", "10"))
+# Keep enough idle connections for every in-flight model call so bursts reuse them.
+HTTPX_MAX_KEEPALIVE = int(os.getenv("HTTPX_MAX_KEEPALIVE", str(MAX_CONCURRENT_MODEL_CALLS)))
+HTTPX_KEEPALIVE_EXPIRY = float(os.getenv("HTTPX_KEEPALIVE_EXPIRY", "120"))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "256"))
+MAX_CONCURRENT_PDF = int(os.getenv("MAX_CONCURRENT_PDF", "4"))
+# cpu_count() reports host CPUs inside containers, and every worker receives a copy of
+# the upload and re-parses it, so keep the default pool small.
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Below this page count, process startup/IPC costs more than parallel extraction saves.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "6"))
+PDF_BUILD_WORKERS = int(os.getenv("PDF_BUILD_WORKERS", "2"))
+# Report builds allowed to run or wait for a worker; beyond this, clients get a 429.
+MAX_PENDING_PDF_BUILDS = int(os.getenv("MAX_PENDING_PDF_BUILDS", str(2 * PDF_BUILD_WORKERS)))
+
+def _new_pdf_pool() -> ProcessPoolExecutor | None:
+    if PDF_EXTRACT_WORKERS <= 1:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=PDF_EXTRACT_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
 
 @app.on_event("startup")
 async def _startup():
     app.state.model_sem = asyncio.Semaphore(MAX_CONCURRENT_MODEL_CALLS)
+    app.state.llm_cache = ResponseCache(LLM_CACHE_SIZE)
+    # Identical hat calls already in flight (e.g. a class pasting the same text) share one request.
+    app.state.inflight = SingleFlight()
+    # Bounds concurrent PDF parsing so it cannot monopolise the shared threadpool.
+    app.state.pdf_sem = asyncio.Semaphore(MAX_CONCURRENT_PDF)
+    app.state.pdf_pool = _new_pdf_pool()
+    # Report generation gets its own threads so it never competes with PDF parsing or
+    # other work on Starlette's shared threadpool.
+    app.state.pdf_build_pool = ThreadPoolExecutor(
+        max_workers=PDF_BUILD_WORKERS,
+        thread_name_prefix="pdfbuild",
+    )
+    app.state.pdf_build_sem = asyncio.Semaphore(MAX_PENDING_PDF_BUILDS)
     app.state.http_client = httpx.AsyncClient(
+        http2=True,
+        headers={
+            "Authorization": f"Bearer {GEMMA_API_KEY}",
+            "Content-Type": "application/json",
+        },
+        timeout=httpx.Timeout(120.0, connect=10.0),
         limits=httpx.Limits(
             max_connections=HTTPX_MAX_CONNECTIONS,
             max_keepalive_connections=HTTPX_MAX_KEEPALIVE,
-        )
+            keepalive_expiry=HTTPX_KEEPALIVE_EXPIRY,
+        ),
     )
 
 @app.on_event("shutdown")
@@ -59,6 +110,45 @@ async def _shutdown():
     client = getattr(app.state, "http_client", None)
     if client is not None:
         await client.aclose()
+    pool = getattr(app.state, "pdf_pool", None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+    build_pool = getattr(app.state, "pdf_build_pool", None)
+    if build_pool is not None:
+        build_pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Multipart framing and the other form fields fit comfortably within this margin.
+_UPLOAD_OVERHEAD_BYTES = 64 * 1024
+
+
+class _UploadSizeLimit:
+    """
+    Plain ASGI middleware that refuses declared-oversize uploads to /api/analyze
+    before the form parser spools the body. Every other request passes straight through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] == "POST" and scope["path"] == "/api/analyze":
+            headers = dict(scope["headers"])
+            content_length = headers.get(b"content-length", b"")
+            if content_length.isdigit() and int(content_length) > MAX_PDF_BYTES + _UPLOAD_OVERHEAD_BYTES:
+                # Only multipart bodies carry a PDF; JSON text has its own character limit.
+                if headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+                    detail = "PDF is too large. Max size is 10MB."
+                else:
+                    detail = "Request body is too large."
+                response = ORJSONResponse({"detail": detail}, status_code=413)
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+# Added before CORS so CORS wraps it and the 413 still carries CORS headers.
+app.add_middleware(_UploadSizeLimit)
 
 
 # FIX 2: safer CORS defaults; do NOT combine allow_credentials=True with "*"
@@ -74,13 +164,45 @@ app.add_middleware(
 )
 
 
-def _extract_pdf_text(file_bytes: bytes) -> str:
-    reader = PdfReader(io.BytesIO(file_bytes))
-    parts: list[str] = []
-    for page in reader.pages:
-        parts.append(page.extract_text() or "")
+async def _extract_pdf_text_async(file_bytes: bytes) -> str:
+    """
+    Extract text without blocking the event loop. Larger PDFs are split into one
+    contiguous page range per worker process; small ones are parsed serially in
+    the threadpool.
+    """
+    pool: ProcessPoolExecutor | None = app.state.pdf_pool
+    if pool is None:
+        return await run_in_threadpool(extract_pdf_text, file_bytes)
+    page_count = await run_in_threadpool(count_pdf_pages, file_bytes)
+    if page_count < PDF_PARALLEL_MIN_PAGES:
+        return await run_in_threadpool(extract_pdf_text, file_bytes)
+
+    n = min(PDF_EXTRACT_WORKERS, page_count)
+    bounds = [page_count * i // n for i in range(n + 1)]
+    loop = asyncio.get_running_loop()
+
+    async def extract_ranges(pool: ProcessPoolExecutor) -> list[str]:
+        return await asyncio.gather(*(
+            loop.run_in_executor(pool, extract_pdf_pages, file_bytes, bounds[i], bounds[i + 1])
+            for i in range(n)
+        ))
+
+    try:
+        parts = await extract_ranges(pool)
+    except BrokenProcessPool:
+        # One dead worker (native crash, OOM kill) breaks the whole pool for good:
+        # swap in a fresh one and retry this upload once.
+        parts = await extract_ranges(_replace_pdf_pool(pool))
     return "\n".join(parts).strip()
 
+
+def _replace_pdf_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    # Concurrent uploads can all hit the same broken pool; only the first replaces it.
+    if app.state.pdf_pool is broken:
+        broken.shutdown(wait=False, cancel_futures=True)
+        app.state.pdf_pool = _new_pdf_pool()
+    return app.state.pdf_pool
+
 _BACK_MATTER_MARKERS = [
     "references",
     "bibliography",
@@ -97,6 +219,26 @@ _BACK_MATTER_MARKERS = [
     "acknowledgements",
 ]
 
+# Any marker as a standalone heading line, e.g. "\nReferences\n", "\nreferences:",
+# "\nAppendix A". One alternation replaces a separate scan per marker.
+_BACK_MATTER_RE = re.compile(
+    r"\n(?:" + "|".join(map(re.escape, _BACK_MATTER_MARKERS)) + r")(?:\b|[ :])",
+    re.IGNORECASE,
+)
+
+# Line endings, runs of spaces/tabs, and 3+ line breaks, normalized in one pass.
+_WS_RE = re.compile(r"(?:\r\n?|\n){3,}|\r\n?|[ \t]+")
+
+
+def _normalize_ws(m: re.Match[str]) -> str:
+    s = m.group()
+    if s[0] in " \t":
+        return " "
+    if s == "\r" or s == "\r\n":
+        return "\n"
+    return "\n\n"
+
+
 def _reduce_academic_pdf_text(text: str) -> str:
     """
     Heuristically remove common academic back-matter (References/Bibliography/Appendix/etc.)
@@ -109,15 +251,10 @@ def _reduce_academic_pdf_text(text: str) -> str:
     if not text:
         return ""
 
-    t = text
-
     # Normalize whitespace (helps pattern matching and reduces noise)
-    t = t.replace("\r\n", "\n").replace("\r", "\n")
-    t = re.sub(r"[ \t]+", " ", t)
-    t = re.sub(r"\n{3,}", "\n\n", t).strip()
+    t = _WS_RE.sub(_normalize_ws, text).strip()
 
-    lower = t.lower()
-    n = len(lower)
+    n = len(t)
     if n < 5000:
         # very short docs: do not cut
         return t
@@ -126,28 +263,11 @@ def _reduce_academic_pdf_text(text: str) -> str:
     # This avoids false positives from "References" in Table of Contents.
     threshold = int(0.45 * n)
 
-    best_cut = None
-
-    # Look for headings on their own line: \nReferences\n, \nAppendix\n, etc.
-    for marker in _BACK_MATTER_MARKERS:
-        # Match marker as a standalone heading line (case-insensitive via lower)
-        # Examples matched:
-        #   "\nreferences\n"
-        #   "\nreferences:\n"
-        #   "\nappendix a\n"
-        pattern = re.compile(rf"\n{re.escape(marker)}(\b|[ :])")
-        m = pattern.search(lower)
-        if m:
-            cut_idx = m.start()
-            if cut_idx >= threshold:
-                if best_cut is None or cut_idx < best_cut:
-                    best_cut = cut_idx
-
-    if best_cut is not None:
-        t = t[:best_cut].strip()
-
-    # Final cleanup
-    t = re.sub(r"\n{3,}", "\n\n", t).strip()
+    # Searching from the threshold skips the front matter entirely; the first
+    # hit is the earliest qualifying marker.
+    m = _BACK_MATTER_RE.search(t, threshold)
+    if m:
+        t = t[:m.start()].strip()
     return t
 
 
@@ -163,37 +283,45 @@ def _validate_text(text: str) -> str:
     return cleaned
 
 
-def _build_prompt(agent: dict[str, Any], text: str) -> list[dict[str, str]]:
-    return [
-        {"role": "system", "content": agent["system"]},
-        {"role": "user", "content": text},
-    ]
+# Request fields shared by every model call; only "messages" varies.
+_BASE_PAYLOAD: dict[str, Any] = {"model": DEFAULT_MODEL, "temperature": 0.3}
+if GEMMA_CACHE_PROMPT:
+    _BASE_PAYLOAD["cache_prompt"] = True
+
 
+@lru_cache(maxsize=None)
+def _system_message(system: str) -> dict[str, str]:
+    # One message per (interned) system prompt, reused by every request.
+    return {"role": "system", "content": system}
 
-async def _call_model(client: httpx.AsyncClient, sem: asyncio.Semaphore, agent: dict[str, Any], text: str) -> str:
+
+def _build_prompt(agent: HatConfig, user_message: dict[str, str]) -> list[dict[str, str]]:
+    return [_system_message(agent.system), user_message]
+
+
+async def _call_model(
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    agent: HatConfig,
+    user_message: dict[str, str],
+) -> str:
     if not GEMMA_API_URL:
         raise RuntimeError("GEMMA_API_URL is not set.")
     if not GEMMA_API_KEY:
         raise RuntimeError("GEMMA_API_KEY is not set.")
 
-    payload = {
-        "model": DEFAULT_MODEL,
-        "messages": _build_prompt(agent, text),
-        "temperature": 0.3,
-    }
-    headers = {"Authorization": f"Bearer {GEMMA_API_KEY}"}
+    payload = {**_BASE_PAYLOAD, "messages": _build_prompt(agent, user_message)}
 
-    timeout = httpx.Timeout(120.0, connect=10.0)
     async with sem:
         try:
-            resp = await client.post(GEMMA_API_URL, json=payload, headers=headers, timeout=timeout)
+            resp = await client.post(GEMMA_API_URL, content=orjson.dumps(payload))
             resp.raise_for_status()
         except httpx.HTTPStatusError as exc:
             raise RuntimeError(f"Model API returned HTTP {exc.response.status_code}.") from exc
         except httpx.RequestError as exc:
             raise RuntimeError("Could not reach the model API.") from exc
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     if "choices" in data:
         return data["choices"][0]["message"]["content"].strip()
     if "generated_text" in data:
@@ -201,21 +329,93 @@ async def _call_model(client: httpx.AsyncClient, sem: asyncio.Semaphore, agent:
     raise RuntimeError("Unexpected response from model API.")
 
 
-async def _run_agents(text: str, agent_configs: list[dict[str, Any]]) -> dict[str, Any]:
-    results: dict[str, Any] = {}
+async def _call_model_cached(
+    cache: ResponseCache,
+    inflight: SingleFlight,
+    cache_key: tuple[str, HatConfig, str],
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    agent: HatConfig,
+    user_message: dict[str, str],
+) -> tuple[str, bool]:
+    """
+    Return (content, served_without_new_call): True for cache hits and for requests
+    that joined an identical call already in flight. Only successful responses are cached.
+    """
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached, True
+
+    async def fetch() -> str:
+        content = await _call_model(client, sem, agent, user_message)
+        cache.set(cache_key, content)
+        return content
+
+    return await inflight.run(cache_key, fetch)
+
+
+async def _run_hat(
+    cache: ResponseCache,
+    inflight: SingleFlight,
+    digest: str,
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    agent: HatConfig,
+    user_message: dict[str, str],
+) -> tuple[HatConfig, dict[str, Any]]:
+    try:
+        content, cached = await _call_model_cached(
+            cache, inflight, (DEFAULT_MODEL, agent, digest), client, sem, agent, user_message
+        )
+    except Exception as exc:
+        return agent, {"status": "error", "message": str(exc)}
+    return agent, {"status": "ok", "content": content, "cached": cached}
+
+
+async def _iter_agent_results(
+    text: str, agent_configs: Sequence[HatConfig]
+) -> AsyncIterator[tuple[HatConfig, dict[str, Any]]]:
+    """
+    Fan the hats out concurrently and yield each result as soon as it finishes,
+    so the fastest hat is not held back by the slowest.
+
+    Each hat prompt is self-contained (system prompt + the same user message, no
+    hat reads another's output), so calls can run in any order. Concurrency across
+    requests is bounded by app.state.model_sem.
+    """
     client: httpx.AsyncClient = app.state.http_client
     sem: asyncio.Semaphore = app.state.model_sem
+    cache: ResponseCache = app.state.llm_cache
+    inflight: SingleFlight = app.state.inflight
+
+    # The user message and input digest are identical for every hat; build them once.
+    user_message = {"role": "user", "content": text}
+    digest = input_digest(text)
+    tasks = [
+        asyncio.ensure_future(_run_hat(cache, inflight, digest, client, sem, agent, user_message))
+        for agent in agent_configs
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away mid-stream: stop paying for hats nobody will read.
+        for task in tasks:
+            task.cancel()
+
 
-    tasks = [_call_model(client, sem, agent, text) for agent in agent_configs]
-    responses = await asyncio.gather(*tasks, return_exceptions=True)
+async def _run_agents(text: str, agent_configs: Sequence[HatConfig]) -> dict[str, Any]:
+    results = {agent.key: result async for agent, result in _iter_agent_results(text, agent_configs)}
+    # Keep hat order stable for clients that iterate the dict.
+    return {agent.key: results[agent.key] for agent in agent_configs}
 
-    for agent, response in zip(agent_configs, responses):
-        if isinstance(response, Exception):
-            results[agent["key"]] = {"status": "error", "message": str(response)}
-        else:
-            results[agent["key"]] = {"status": "ok", "content": response}
-    return results
 
+async def _stream_agents(
+    text: str, agent_configs: Sequence[HatConfig], answer_length: str
+) -> AsyncIterator[bytes]:
+    async for agent, result in _iter_agent_results(text, agent_configs):
+        yield orjson.dumps({"event": "hat", "key": agent.key, "result": result}) + b"\n"
+    yield orjson.dumps({"event": "done", "meta": {"answer_length": answer_length}}) + b"\n"
 
 
 @app.get("/api/health")
@@ -232,6 +432,19 @@ async def buildinfo():
         "index_exists": (dist_dir / "index.html").exists(),
     }
 
+@app.get("/api/hats")
+async def list_hats(answer_length: str = "long") -> list[dict[str, Any]]:
+    agent_configs = get_agent_configs("short" if answer_length.strip().lower() == "short" else "long")
+    return [
+        {
+            "key": agent.key,
+            "label": agent.label,
+            "focus": agent.focus,
+            "system_tokens": agent.system_tokens,
+        }
+        for agent in agent_configs
+    ]
+
 @app.head("/")
 async def head_root():
     return Response(status_code=200)
@@ -243,16 +456,20 @@ async def analyze(
     text: str | None = Form(None),
     file: UploadFile | None = File(None),
     answer_length: str | None = Form(None),
-) -> JSONResponse:
+) -> Response:
 
     if file is not None:
         if file.content_type != "application/pdf":
             raise HTTPException(status_code=400, detail="Only PDF uploads are supported.")
-        file_bytes = await file.read()
+        # Check the spooled size first and never read more than one byte past the cap.
+        if file.size is not None and file.size > MAX_PDF_BYTES:
+            raise HTTPException(status_code=413, detail="PDF is too large. Max size is 10MB.")
+        file_bytes = await file.read(MAX_PDF_BYTES + 1)
         if len(file_bytes) > MAX_PDF_BYTES:
             raise HTTPException(status_code=413, detail="PDF is too large. Max size is 10MB.")
         try:
-            extracted = _extract_pdf_text(file_bytes)
+            async with app.state.pdf_sem:
+                extracted = await _extract_pdf_text_async(file_bytes)
         except Exception as exc:
             raise HTTPException(status_code=400, detail="Unable to read PDF text.") from exc
         extracted = _reduce_academic_pdf_text(extracted)
@@ -262,7 +479,7 @@ async def analyze(
         content_type = request.headers.get("content-type", "")
         if text is None and content_type.startswith("application/json"):
             try:
-                body = await request.json()
+                body = orjson.loads(await request.body())
             except Exception:
                 body = None
             if isinstance(body, dict):
@@ -279,7 +496,17 @@ async def analyze(
     if answer_length_normalized not in {"short", "long"}:
         raise HTTPException(status_code=400, detail="answer_length must be 'short' or 'long'.")
 
-    agent_configs = AGENT_CONFIGS_SHORT if answer_length_normalized == "short" else AGENT_CONFIGS
+    agent_configs = get_agent_configs(answer_length_normalized)
+
+    # Clients that accept NDJSON get one line per hat as it completes; everyone
+    # else gets the full result set in a single JSON response.
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _stream_agents(cleaned, agent_configs, answer_length_normalized),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     results = await _run_agents(cleaned, agent_configs)
 
     if all(v.get("status") == "error" for v in results.values()):
@@ -291,37 +518,110 @@ async def analyze(
             },
         )
 
-    return JSONResponse({"analysis": results, "meta": {"answer_length": answer_length_normalized}})
+    ok_results = [v for v in results.values() if v.get("status") == "ok"]
+    hits = sum(1 for v in ok_results if v.get("cached"))
+    cache_status = "HIT" if hits == len(ok_results) else "MISS" if hits == 0 else "PARTIAL"
+
+    return ORJSONResponse(
+        {"analysis": results, "meta": {"answer_length": answer_length_normalized}},
+        headers={"X-Cache": cache_status},
+    )
 
 
 _MD_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
 _MD_BULLET_RE = re.compile(r"^(\s*)([-*])\s+(.*)$")
 
-def _md_inline_to_rl(text: str) -> str:
-    """
-    Convert a small, safe subset of Markdown inline formatting to ReportLab's
-    Paragraph markup (HTML-ish): **bold**, *italic*, `code`.
-    """
-    if not text:
-        return ""
-
-    # Escape basic XML chars first
-    text = (
-        text.replace("&", "&amp;")
-            .replace("<", "&lt;")
-            .replace(">", "&gt;")
-    )
+# ReportLab styles are built once per process; flowable builders only reference them.
+_SAMPLE_STYLES = getSampleStyleSheet()
+_BODYTEXT_STYLE = _SAMPLE_STYLES["BodyText"]
+
+_PDF_STYLES: dict[str, ParagraphStyle] = {}
+_PDF_STYLES["body"] = ParagraphStyle(
+    "CTBody",
+    parent=_SAMPLE_STYLES["BodyText"],
+    fontName="Helvetica",
+    fontSize=10.5,
+    leading=14,
+    spaceAfter=8,
+)
+_PDF_STYLES["h1"] = ParagraphStyle(
+    "CTH1",
+    parent=_SAMPLE_STYLES["Heading1"],
+    fontName="Helvetica-Bold",
+    fontSize=16,
+    leading=20,
+    spaceBefore=12,
+    spaceAfter=8,
+    textColor=colors.HexColor("#111827"),
+)
+_PDF_STYLES["h2"] = ParagraphStyle(
+    "CTH2",
+    parent=_SAMPLE_STYLES["Heading2"],
+    fontName="Helvetica-Bold",
+    fontSize=13,
+    leading=16,
+    spaceBefore=12,
+    spaceAfter=6,
+    textColor=colors.HexColor("#111827"),
+)
+_PDF_STYLES["h3"] = ParagraphStyle(
+    "CTH3",
+    parent=_SAMPLE_STYLES["Heading3"],
+    fontName="Helvetica-Bold",
+    fontSize=11.5,
+    leading=14,
+    spaceBefore=10,
+    spaceAfter=4,
+    textColor=colors.HexColor("#111827"),
+)
+_PDF_STYLES["bullet"] = ParagraphStyle(
+    "CTBullet",
+    parent=_PDF_STYLES["body"],
+    leftIndent=18,
+    firstLineIndent=-8,
+    spaceAfter=4,
+)
+_PDF_STYLES["title"] = ParagraphStyle(
+    "CTTitle",
+    parent=_SAMPLE_STYLES["Title"],
+    fontName="Helvetica-Bold",
+    fontSize=22,
+    leading=26,
+    textColor=colors.HexColor("#111827"),
+    spaceAfter=10,
+)
+_PDF_STYLES["subtitle"] = ParagraphStyle(
+    "CTSubtitle",
+    parent=_SAMPLE_STYLES["BodyText"],
+    fontName="Helvetica",
+    fontSize=11,
+    leading=14,
+    textColor=colors.HexColor("#374151"),
+    spaceAfter=18,
+)
+_PDF_STYLES["meta"] = ParagraphStyle(
+    "CTMeta",
+    parent=_SAMPLE_STYLES["BodyText"],
+    fontName="Helvetica",
+    fontSize=9.5,
+    leading=12,
+    textColor=colors.HexColor("#6B7280"),
+    spaceAfter=6,
+)
 
-    # Inline code
-    text = re.sub(r"`([^`]+)`", r'<font face="Courier">\1</font>', text)
 
-    # Bold **...**
-    text = re.sub(r"\*\*([^*]+)\*\*", r"<b>\1</b>", text)
+def _nested_bullet_style(level: int) -> ParagraphStyle:
+    # simple nesting by indent: two spaces of source indent -> 10pt
+    left_indent = 18 + level * 10
+    return ParagraphStyle(
+        f"CTBullet_{left_indent}",
+        parent=_PDF_STYLES["bullet"],
+        leftIndent=left_indent,
+    )
 
-    # Italic *...* (avoid clobbering bullet markers and already-converted tags)
-    text = re.sub(r"(?<!\*)\*([^*]+)\*(?!\*)", r"<i>\1</i>", text)
 
-    return text
+# Nesting levels 0..4 cover real hat output; deeper levels are built on demand.
+_BULLET_STYLES: tuple[ParagraphStyle, ...] = tuple(_nested_bullet_style(level) for level in range(5))
 
 
 def _markdown_to_flowables(markdown_text: str) -> list[Any]:
@@ -331,60 +631,12 @@ def _markdown_to_flowables(markdown_text: str) -> list[Any]:
     - paragraphs (reflow wrapped lines)
     - bullet lists (-, *)
     """
-    styles = getSampleStyleSheet()
-
-    body = ParagraphStyle(
-        "CTBody",
-        parent=styles["BodyText"],
-        fontName="Helvetica",
-        fontSize=10.5,
-        leading=14,
-        spaceAfter=8,
-    )
-    h1 = ParagraphStyle(
-        "CTH1",
-        parent=styles["Heading1"],
-        fontName="Helvetica-Bold",
-        fontSize=16,
-        leading=20,
-        spaceBefore=12,
-        spaceAfter=8,
-        textColor=colors.HexColor("#111827"),
-    )
-    h2 = ParagraphStyle(
-        "CTH2",
-        parent=styles["Heading2"],
-        fontName="Helvetica-Bold",
-        fontSize=13,
-        leading=16,
-        spaceBefore=12,
-        spaceAfter=6,
-        textColor=colors.HexColor("#111827"),
-    )
-    h3 = ParagraphStyle(
-        "CTH3",
-        parent=styles["Heading3"],
-        fontName="Helvetica-Bold",
-        fontSize=11.5,
-        leading=14,
-        spaceBefore=10,
-        spaceAfter=4,
-        textColor=colors.HexColor("#111827"),
-    )
-    bullet_style = ParagraphStyle(
-        "CTBullet",
-        parent=body,
-        leftIndent=18,
-        firstLineIndent=-8,
-        spaceAfter=4,
-    )
-
     def flush_paragraph(buf: list[str], out: list[Any]) -> None:
         if not buf:
             return
         text = " ".join(s.strip() for s in buf).strip()
         if text:
-            out.append(Paragraph(_md_inline_to_rl(text), body))
+            out.append(Paragraph(md_inline_to_rl(text), _PDF_STYLES["body"]))
         buf.clear()
 
     out: list[Any] = []
@@ -409,35 +661,37 @@ def _markdown_to_flowables(markdown_text: str) -> list[Any]:
             flush_list()
             continue
 
+        # Only lines opening with a marker character can be headings or bullets;
+        # plain body text skips both regexes.
+        marker = stripped[0]
+
         # heading?
-        m = _MD_HEADING_RE.match(stripped)
+        m = _MD_HEADING_RE.match(stripped) if marker == "#" else None
         if m:
             flush_paragraph(paragraph_buf, out)
             flush_list()
             level = len(m.group(1))
-            text = _md_inline_to_rl(m.group(2).strip())
+            text = md_inline_to_rl(m.group(2).strip())
             if level <= 1:
-                out.append(Paragraph(text, h1))
+                out.append(Paragraph(text, _PDF_STYLES["h1"]))
             elif level == 2:
-                out.append(Paragraph(text, h2))
+                out.append(Paragraph(text, _PDF_STYLES["h2"]))
             else:
-                out.append(Paragraph(text, h3))
+                out.append(Paragraph(text, _PDF_STYLES["h3"]))
             continue
 
         # bullet?
-        mb = _MD_BULLET_RE.match(line)
+        mb = _MD_BULLET_RE.match(line) if marker in "-*" else None
         if mb:
             flush_paragraph(paragraph_buf, out)
             indent_spaces = len(mb.group(1) or "")
-            item_text = _md_inline_to_rl(mb.group(3).strip())
-
-            # simple nesting by indent
-            left_indent = 18 + (indent_spaces // 2) * 10
-            nested_style = ParagraphStyle(
-                f"CTBullet_{left_indent}",
-                parent=bullet_style,
-                leftIndent=left_indent,
-            )
+            item_text = md_inline_to_rl(mb.group(3).strip())
+
+            level = indent_spaces // 2
+            if level < len(_BULLET_STYLES):
+                nested_style = _BULLET_STYLES[level]
+            else:
+                nested_style = _nested_bullet_style(level)
             list_items.append(ListItem(Paragraph(item_text, nested_style)))
             continue
 
@@ -467,16 +721,16 @@ def _draw_header_footer(canvas, doc):
     canvas.restoreState()
 
 
-def _agent_header_card(agent: dict[str, Any]) -> Table:
+def _agent_header_card(agent: HatConfig) -> Table:
     """
     A simple 'card' with agent label + focus.
     """
-    label = agent.get("label", "Hat")
-    focus = agent.get("focus", "")
+    label = agent.label
+    focus = agent.focus
 
     data = [
-        [Paragraph(f"<b>{_md_inline_to_rl(label)} Hat</b>", getSampleStyleSheet()["BodyText"]),
-         Paragraph(_md_inline_to_rl(focus), getSampleStyleSheet()["BodyText"])]
+        [Paragraph(f"<b>{md_inline_to_rl(label)} Hat</b>", _BODYTEXT_STYLE),
+         Paragraph(md_inline_to_rl(focus), _BODYTEXT_STYLE)]
     ]
     t = Table(data, colWidths=[2.1 * inch, 4.9 * inch])
     t.setStyle(TableStyle([
@@ -488,9 +742,35 @@ def _agent_header_card(agent: dict[str, Any]) -> Table:
     return t
 
 
+def _hat_content(
+    analysis: dict[str, Any],
+    notes: dict[str, str] | None,
+    agent: HatConfig,
+) -> str:
+    """
+    Markdown for one hat's report section: the model output, prefixed with any
+    student-group notes passed at export time.
+    """
+    key = agent.key
+    block = analysis.get(key, {}) if isinstance(analysis, dict) else {}
+    content = block.get("content") or "Analysis unavailable."
+
+    notes_text = ""
+    if isinstance(notes, dict):
+        raw_notes = notes.get(key)
+        if isinstance(raw_notes, str) and raw_notes.strip():
+            notes_text = raw_notes.strip()
+
+    if notes_text:
+        # Prepend student-group notes for this hat (client-side notes passed at export time)
+        content = f"### Group Notes\n{notes_text}\n\n---\n\n{content}"
+
+    return content
+
+
 def _build_pdf(
     analysis: dict[str, Any],
-    agent_configs: list[dict[str, Any]],
+    agent_configs: Sequence[HatConfig],
     notes: dict[str, str] | None = None,
 ) -> bytes:
     buffer = io.BytesIO()
@@ -506,43 +786,18 @@ def _build_pdf(
         author="Six Thinking Hats",
     )
 
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "CTTitle",
-        parent=styles["Title"],
-        fontName="Helvetica-Bold",
-        fontSize=22,
-        leading=26,
-        textColor=colors.HexColor("#111827"),
-        spaceAfter=10,
-    )
-    subtitle_style = ParagraphStyle(
-        "CTSubtitle",
-        parent=styles["BodyText"],
-        fontName="Helvetica",
-        fontSize=11,
-        leading=14,
-        textColor=colors.HexColor("#374151"),
-        spaceAfter=18,
-    )
-    meta_style = ParagraphStyle(
-        "CTMeta",
-        parent=styles["BodyText"],
-        fontName="Helvetica",
-        fontSize=9.5,
-        leading=12,
-        textColor=colors.HexColor("#6B7280"),
-        spaceAfter=6,
-    )
+    title_style = _PDF_STYLES["title"]
+    subtitle_style = _PDF_STYLES["subtitle"]
+    meta_style = _PDF_STYLES["meta"]
 
     story: list[Any] = []
 
     # --- Cover page ---
     story.append(Paragraph("Six Thinking Hats Analysis Report", title_style))
-    story.append(Paragraph(datetime.utcnow().strftime("Generated on %B %d, %Y"), subtitle_style))
+    story.append(Paragraph(datetime.now(timezone.utc).strftime("Generated on %B %d, %Y"), subtitle_style))
 
     # quick index of sections
-    section_list = "<br/>".join([f"• {a.get('label','Hat')} Hat" for a in agent_configs])
+    section_list = "<br/>".join([f"• {a.label} Hat" for a in agent_configs])
     story.append(Paragraph(f"<b>Sections</b><br/>{section_list}", meta_style))
 
     story.append(Spacer(1, 16))
@@ -556,19 +811,7 @@ def _build_pdf(
 
     # --- Hat sections ---
     for idx, agent in enumerate(agent_configs):
-        key = agent["key"]
-        block = analysis.get(key, {}) if isinstance(analysis, dict) else {}
-        content = block.get("content") or "Analysis unavailable."
-
-        notes_text = ""
-        if isinstance(notes, dict):
-            raw_notes = notes.get(key)
-            if isinstance(raw_notes, str) and raw_notes.strip():
-                notes_text = raw_notes.strip()
-
-        if notes_text:
-            # Prepend student-group notes for this hat (client-side notes passed at export time)
-            content = f"### Group Notes\n{notes_text}\n\n---\n\n{content}"
+        content = _hat_content(analysis, notes, agent)
 
         # section header card + divider
         story.append(KeepTogether([
@@ -592,7 +835,7 @@ def _build_pdf(
 
 
 @app.post("/api/generate-pdf")
-async def generate_pdf(payload: dict[str, Any]) -> StreamingResponse:
+async def generate_pdf(payload: dict[str, Any]) -> Response:
     analysis = payload.get("analysis") if isinstance(payload, dict) else None
     if not isinstance(analysis, dict):
         raise HTTPException(status_code=400, detail="Analysis data missing.")
@@ -605,26 +848,54 @@ async def generate_pdf(payload: dict[str, Any]) -> StreamingResponse:
     if answer_length_normalized not in {"short", "long"}:
         answer_length_normalized = "long"
 
-    agent_configs = AGENT_CONFIGS_SHORT if answer_length_normalized == "short" else AGENT_CONFIGS
-    pdf_bytes = await run_in_threadpool(_build_pdf, analysis, agent_configs, notes)
+    agent_configs = get_agent_configs(answer_length_normalized)
+    build_sem: asyncio.Semaphore = app.state.pdf_build_sem
+    if build_sem.locked():
+        raise HTTPException(
+            status_code=429,
+            detail="Too many reports are being generated. Please try again shortly.",
+        )
+    async with build_sem:
+        loop = asyncio.get_running_loop()
+        pdf_bytes = await loop.run_in_executor(
+            app.state.pdf_build_pool, _build_pdf, analysis, agent_configs, notes
+        )
 
 
+    # ReportLab only emits the file once doc.build() finishes, so there is nothing to
+    # stream; hand the finished bytes over directly instead of re-wrapping them.
     headers = {"Content-Disposition": "attachment; filename=SixThinkingHatsReport.pdf"}
-    return StreamingResponse(io.BytesIO(pdf_bytes), media_type="application/pdf", headers=headers)
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
 
 dist_dir = Path(os.getenv("FRONTEND_DIST", "frontend_dist")).resolve()
 index_html = dist_dir / "index.html"
 assets_dir = dist_dir / "assets"
 
+
+def _scan_static_files(root: Path) -> frozenset[str]:
+    """Relative POSIX paths of every file under root (empty if it does not exist)."""
+    found: set[str] = set()
+    for dirpath, _dirnames, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root)
+        for name in filenames:
+            found.add((rel_dir / name).as_posix())
+    return frozenset(found)
+
+
+# The built frontend does not change while the server runs: index it once so SPA
+# routes and unknown paths are answered without touching the filesystem.
+_static_files = _scan_static_files(dist_dir)
+_index_html_bytes = index_html.read_bytes() if index_html.is_file() else None
+
 if assets_dir.exists():
     app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
 
 @app.get("/", include_in_schema=False)
 async def spa_index():
-    if index_html.exists():
-        return FileResponse(index_html)
+    if _index_html_bytes is not None:
+        return Response(content=_index_html_bytes, media_type="text/html")
     # If you still see JSON at / after this, you're not running this file.
-    return JSONResponse(
+    return ORJSONResponse(
         {"status": "ok", "note": "Frontend index.html not found", "FRONTEND_DIST": str(dist_dir)},
         status_code=200,
     )
@@ -634,11 +905,10 @@ async def spa_fallback(full_path: str):
     if full_path == "api" or full_path.startswith("api/"):
         raise HTTPException(status_code=404, detail="Not Found")
 
-    candidate = dist_dir / full_path
-    if candidate.is_file():
-        return FileResponse(candidate)
+    if full_path in _static_files:
+        return FileResponse(dist_dir / full_path)
 
-    if index_html.exists():
-        return FileResponse(index_html)
+    if _index_html_bytes is not None:
+        return Response(content=_index_html_bytes, media_type="text/html")
 
     raise HTTPException(status_code=404, detail="Not Found")
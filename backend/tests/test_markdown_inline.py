@@ -0,0 +1,59 @@
+import random
+import re
+import unittest
+
+from backend.app.markdown_inline import md_inline_to_rl
+
+
+def _baseline_md_inline_to_rl(text: str) -> str:
+    # The original three-replace, three-sub conversion, kept as the reference.
+    if not text:
+        return ""
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    text = re.sub(r"`([^`]+)`", r'<font face="Courier">\1</font>', text)
+    text = re.sub(r"\*\*([^*]+)\*\*", r"<b>\1</b>", text)
+    return re.sub(r"(?<!\*)\*([^*]+)\*(?!\*)", r"<i>\1</i>", text)
+
+
+class MarkdownInlineTests(unittest.TestCase):
+    def test_matches_baseline_for_emphasis(self) -> None:
+        cases = {
+            "**x**": "<b>x</b>",
+            "*x*": "<i>x</i>",
+            "***both***": "<i><b>both</b></i>",
+            "*a **b** c*": "<i>a <b>b</b> c</i>",
+            "`code`": '<font face="Courier">code</font>',
+            "a < b & c > d": "a &lt; b &amp; c &gt; d",
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(_baseline_md_inline_to_rl(text), expected)
+                self.assertEqual(md_inline_to_rl(text), expected)
+
+    def test_matches_baseline_without_code_spans(self) -> None:
+        rng = random.Random(0)
+        for _ in range(20_000):
+            text = "".join(rng.choice("ab *&<") for _ in range(rng.randint(0, 16)))
+            with self.subTest(text=text):
+                self.assertEqual(md_inline_to_rl(text), _baseline_md_inline_to_rl(text))
+
+    def test_code_spans_stay_literal(self) -> None:
+        # The baseline opened <i> inside the code span and closed it after </font>.
+        self.assertEqual(
+            md_inline_to_rl("`a*b` and *c*"),
+            '<font face="Courier">a*b</font> and <i>c</i>',
+        )
+        self.assertEqual(
+            md_inline_to_rl("`x*` y*"),
+            '<font face="Courier">x*</font> y*',
+        )
+
+    def test_emphasis_can_wrap_code_spans(self) -> None:
+        self.assertEqual(
+            md_inline_to_rl("**run `make`** then *`test`*"),
+            '<b>run <font face="Courier">make</font></b> then <i><font face="Courier">test</font></i>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import asyncio
+import io
+import os
+import signal
+import unittest
+
+from reportlab.lib.pagesizes import LETTER
+from reportlab.pdfgen import canvas
+
+from backend import main
+
+
+def _make_pdf(pages: int) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=LETTER)
+    for i in range(pages):
+        pdf.drawString(72, 720, f"Page {i + 1} text")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+class PooledExtractionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pdf = _make_pdf(10)
+        self._workers = main.PDF_EXTRACT_WORKERS
+        main.PDF_EXTRACT_WORKERS = 2
+        main.app.state.pdf_pool = main._new_pdf_pool()
+
+    def tearDown(self) -> None:
+        main.app.state.pdf_pool.shutdown(wait=True, cancel_futures=True)
+        main.PDF_EXTRACT_WORKERS = self._workers
+
+    def test_extraction_recovers_after_a_worker_is_killed(self) -> None:
+        original = main.app.state.pdf_pool
+        self.assertIn("Page 10 text", asyncio.run(main._extract_pdf_text_async(self.pdf)))
+
+        for pid in list(original._processes):
+            os.kill(pid, signal.SIGKILL)
+
+        for _ in range(2):
+            text = asyncio.run(main._extract_pdf_text_async(self.pdf))
+            self.assertIn("Page 1 text", text)
+            self.assertIn("Page 10 text", text)
+        self.assertIsNot(main.app.state.pdf_pool, original)
+        self.assertIsNotNone(main.app.state.pdf_pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+
+from backend.app.response_cache import SingleFlight
+
+
+class SingleFlightTests(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_callers_share_one_call(self) -> None:
+        sf = SingleFlight()
+        calls = 0
+
+        async def work() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(sf.run("k", work) for _ in range(3)))
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(results, [("result", False), ("result", True), ("result", True)])
+
+    async def test_shared_result_survives_one_waiter_leaving(self) -> None:
+        sf = SingleFlight()
+        release = asyncio.Event()
+
+        async def work() -> str:
+            await release.wait()
+            return "result"
+
+        leaving = asyncio.ensure_future(sf.run("k", work))
+        staying = asyncio.ensure_future(sf.run("k", work))
+        await asyncio.sleep(0)
+
+        leaving.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await staying, ("result", True))
+        self.assertTrue(leaving.cancelled())
+
+    async def test_new_caller_after_last_waiter_left_starts_fresh(self) -> None:
+        sf = SingleFlight()
+        started = asyncio.Event()
+
+        async def slow_to_cancel() -> str:
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            finally:
+                # Cleanup that spans loop iterations, like closing an HTTP stream.
+                await asyncio.shield(asyncio.sleep(0.05))
+            return "stale"
+
+        async def work() -> str:
+            return "fresh"
+
+        caller = asyncio.ensure_future(sf.run("k", slow_to_cancel))
+        await started.wait()
+        caller.cancel()
+        await asyncio.sleep(0)
+
+        self.assertEqual(await sf.run("k", work), ("fresh", False))
+
+
+if __name__ == "__main__":
+    unittest.main()
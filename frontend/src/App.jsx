@@ -1,6 +1,6 @@
 import { useEffect, useMemo, useRef, useState } from 'react'
-import ReactMarkdown from 'react-markdown'
 import HowToUse from './HowToUse'
+import MemoizedMarkdown from './MemoizedMarkdown'
 
 const HATS = [
   {
@@ -42,6 +42,7 @@ const HATS = [
 ]
 
 const API_PREFIX = '/api'
+const NDJSON = 'application/x-ndjson'
 
 const EXAMPLE_TOPIC = `We are considering replacing traditional closed-book exams with open-book, AI-assisted assessments in a university module.\n\nWe want to decide whether to adopt this change next semester, and if so, how to implement it responsibly.`
 
@@ -75,6 +76,25 @@ function buildStructuredText({ topic, decision, stakeholders, constraints, conte
   return lines.join('\n').trim()
 }
 
+// Read an NDJSON response body line by line, calling onEvent for each parsed line.
+async function readNdjson(response, onEvent) {
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    const lines = buffer.split('\n')
+    buffer = lines.pop()
+    for (const line of lines) {
+      if (line.trim()) onEvent(JSON.parse(line))
+    }
+  }
+  buffer += decoder.decode()
+  if (buffer.trim()) onEvent(JSON.parse(buffer))
+}
+
 export default function App() {
   const [mode, setMode] = useState('text')
 
@@ -128,12 +148,13 @@ export default function App() {
         formData.append('answer_length', answerLength)
         response = await fetch(`${API_PREFIX}/analyze`, {
           method: 'POST',
+          headers: { Accept: NDJSON },
           body: formData
         })
       } else {
         response = await fetch(`${API_PREFIX}/analyze`, {
           method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
+          headers: { 'Content-Type': 'application/json', Accept: NDJSON },
           body: JSON.stringify({ text: structuredText, answer_length: answerLength })
         })
       }
@@ -143,12 +164,46 @@ export default function App() {
         throw new Error(detail.detail || 'Analysis failed. Please try again.')
       }
 
-      const data = await response.json()
-      setAnalysis(data.analysis)
-      if (data?.meta?.answer_length) setAnswerLength(data.meta.answer_length)
+      // Hats stream in as they finish; show the results panel straight away.
+      setAnalysis({})
       setSelectedHat('blue')
       setHatMenuOpen(false)
       if (resultsRef.current) resultsRef.current.scrollIntoView({ behavior: 'smooth' })
+
+      const received = {}
+      let finished = false
+      try {
+        await readNdjson(response, (event) => {
+          if (event.event === 'hat') {
+            received[event.key] = event.result
+            setAnalysis((prev) => ({ ...prev, [event.key]: event.result }))
+          } else if (event.event === 'done') {
+            finished = true
+            if (event.meta?.answer_length) setAnswerLength(event.meta.answer_length)
+          }
+        })
+      } finally {
+        if (!finished) {
+          // Stream cut short (proxy timeout, server restart): don't leave hats "Thinking…" forever.
+          const missing = { status: 'error', message: 'This hat did not finish. Please run the analysis again.' }
+          setAnalysis((prev) => {
+            const next = { ...prev }
+            for (const hat of HATS) {
+              if (!next[hat.key]) next[hat.key] = missing
+            }
+            return next
+          })
+        }
+      }
+
+      if (!finished) {
+        throw new Error('The analysis was interrupted before every hat finished. Please try again.')
+      }
+
+      const statuses = Object.values(received)
+      if (statuses.length && statuses.every((r) => r.status === 'error')) {
+        throw new Error('Analysis failed (all hats errored).')
+      }
     } catch (err) {
       setError(err.message || 'Something went wrong. Please try again.')
     } finally {
@@ -439,7 +494,7 @@ export default function App() {
                 type="button"
                 className="secondary"
                 onClick={handleDownload}
-                disabled={!analysis || downloadLoading}
+                disabled={!analysis || loading || downloadLoading}
               >
                 {downloadLoading ? 'Preparing PDF…' : 'Download report'}
               </button>
@@ -547,6 +602,13 @@ export default function App() {
                 </div>
               )}
 
+              {analysis && !activeAnalysis && (
+                <div className="empty">
+                  <h3>Thinking…</h3>
+                  <p>The {activeHat?.label} Hat output will appear here as soon as it is ready.</p>
+                </div>
+              )}
+
               {analysis && activeAnalysis?.status === 'error' && (
                 <div className="error-state">
                   <h3>Output unavailable</h3>
@@ -554,7 +616,7 @@ export default function App() {
                 </div>
               )}
 
-              {analysis && activeAnalysis?.status === 'ok' && <ReactMarkdown>{activeAnalysis.content}</ReactMarkdown>}
+              {analysis && activeAnalysis?.status === 'ok' && <MemoizedMarkdown content={activeAnalysis.content} />}
             </div>
 
             <aside className="panel" aria-label="Group notes">
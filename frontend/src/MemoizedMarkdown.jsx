@@ -0,0 +1,10 @@
+import { memo } from 'react'
+import ReactMarkdown from 'react-markdown'
+
+// Hat output always arrives whole, so skipping re-parses on unrelated re-renders
+// (typing notes, toggling menus) only needs a memo keyed on the content.
+const MemoizedMarkdown = memo(function MemoizedMarkdown({ content }) {
+  return <ReactMarkdown>{content}</ReactMarkdown>
+})
+
+export default MemoizedMarkdown